@@ -37,13 +37,26 @@ async function fetchData(file) {
     } catch (e) { console.error(`Error fetching ${file}:`, e); return null; }
 }
 
+// Expand columnar data ({ year: [...], month: [...], ... }) into records
+function toRecords(dataset) {
+    if (!dataset || !dataset.data || Array.isArray(dataset.data)) return dataset;
+    const cols = dataset.data, keys = Object.keys(cols), n = keys.length ? cols[keys[0]].length : 0;
+    const records = new Array(n);
+    for (let i = 0; i < n; i++) {
+        const rec = {};
+        keys.forEach(k => { rec[k] = cols[k][i]; });
+        records[i] = rec;
+    }
+    return { ...dataset, data: records };
+}
+
 async function loadAllData() {
     const [co2, temp, ice] = await Promise.all([
         fetchData('co2_monthly.json'),
         fetchData('temperature_anomaly.json'),
         fetchData('sea_ice_extent.json')
     ]);
-    state.co2Data = co2; state.temperatureData = temp; state.seaIceData = ice;
+    state.co2Data = co2; state.temperatureData = toRecords(temp); state.seaIceData = ice;
     return !!(co2 || temp || ice);
 }
 
@@ -140,7 +153,10 @@ function updateStats() {
             }
         }
     }
-    const upd = state.co2Data?.last_updated || state.temperatureData?.last_updated || state.seaIceData?.last_updated;
+    // Datasets whose upstream didn't change keep their older timestamp, so show the newest one
+    const upd = [state.co2Data, state.temperatureData, state.seaIceData]
+        .map(d => d?.last_updated).filter(Boolean)
+        .reduce((a, b) => (new Date(b) > new Date(a) ? b : a), null);
     if (upd) document.getElementById('last-updated').textContent = utils.formatDate(upd);
 }
 
@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 
 urls = [
     'https://masie_web.apps.nsidc.org/pub/DATASETS/NOAA/G02135/north/daily/data/N_seaice_extent_daily_v3.0.csv',
@@ -6,9 +9,19 @@ urls = [
     'https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_mm_mlo.csv'
 ]
 
-for url in urls:
+# Keep-alive session without retries, so every status code is reported as-is;
+# one pooled connection per concurrent probe
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_maxsize=len(urls), max_retries=0))
+
+def probe(url):
     try:
-        r = requests.head(url, timeout=5)
-        print(f"{url}: {r.status_code}")
+        r = session.head(url, timeout=5, allow_redirects=True)
+        return url, r.status_code
     except Exception as e:
-        print(f"{url}: {e}")
+        return url, e
+
+# Probe all hosts at once so total time is the slowest round trip
+with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+    for url, status in executor.map(probe, urls):
+        print(f"{url}: {status}")
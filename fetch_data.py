@@ -4,21 +4,49 @@ Climate Data Fetcher
 Fetches climate data from NOAA, NASA, and NSIDC and saves as JSON.
 """
 
-import json
+import concurrent.futures
+import gzip
+import hashlib
+import io
 import os
+import threading
+import time
+import orjson
 import requests
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from io import StringIO
+import pyarrow as pa
+import pyarrow.csv as pac
+from datetime import datetime, timezone
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Suppress insecure request warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Configuration
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+# Raw downloads plus their HTTP validators (ETag / Last-Modified)
+CACHE_DIR = os.path.join(DATA_DIR, '.cache')
 TIMEOUT = 60
+# Read buffer for streamed downloads; also bounds the header pre-scan
+STREAM_BUFFER_SIZE = 64 * 1024
+# Set PRETTY_JSON=1 to write indented JSON for debugging
+PRETTY_JSON = os.environ.get('PRETTY_JSON') == '1'
+# Block size for incremental CSV parsing (bounds memory of the sea ice parse)
+CSV_BLOCK_SIZE = 1 << 20
+# Set USE_CACHE=1 to reuse parsed DataFrames from the Parquet cache (dev loop)
+USE_CACHE = os.environ.get('USE_CACHE') == '1'
+# Maximum age in seconds of a Parquet cache entry
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 6 * 3600))
+# Level for the precompressed .json.gz copies written next to each JSON file
+GZIP_LEVEL = 6
+
+# GISS month column names and their month numbers
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+MONTH_INDEX = {month: i for i, month in enumerate(MONTH_NAMES, 1)}
 
 # Data source URLs
 URLS = {
@@ -28,317 +56,549 @@ URLS = {
     'sea_ice': 'https://masie_web.apps.nsidc.org/pub/DATASETS/NOAA/G02135/north/daily/data/N_seaice_extent_daily_v3.0.csv'
 }
 
+def create_session():
+    """Create a pooled HTTP session with keep-alive and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+    return session
+
+# Shared session so consecutive downloads reuse pooled connections
+SESSION = create_session()
+
+# Hash of this script, so a changed parser/emitter invalidates stored digests
+with open(os.path.abspath(__file__), 'rb') as _f:
+    CODE_DIGEST = hashlib.sha256(_f.read()).hexdigest()
+
+# Per-thread output buffer, so concurrently running fetchers print their
+# sections whole instead of interleaving line by line
+_output = threading.local()
+
+def log(message):
+    """Print a message, or collect it while running under run_buffered()."""
+    lines = getattr(_output, 'lines', None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+def run_buffered(fn, *args):
+    """Run fn with its log() output collected; returns (result, output)."""
+    _output.lines = []
+    try:
+        result = fn(*args)
+    except BaseException:
+        print('\n'.join(_output.lines))
+        raise
+    else:
+        return result, '\n'.join(_output.lines)
+    finally:
+        _output.lines = None
+
+def write_atomic(path, data):
+    """Write bytes to path via a temp file and os.replace, so readers never see a partial file."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def fetch_with_cache(name, url, **kwargs):
+    """Download a CSV into the gzip cache, revalidating with a conditional GET.
+    
+    Returns the path of the cached, gzip-compressed CSV and the SHA-256 of
+    its (uncompressed) body.
+    """
+    cache_path = os.path.join(CACHE_DIR, f'{name}.csv.gz')
+    meta_path = os.path.join(CACHE_DIR, f'{name}.meta.json')
+    
+    # Only revalidate when there is a cached body to fall back on
+    headers = {}
+    meta = {}
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path, 'rb') as f:
+            meta = orjson.loads(f.read())
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    
+    with SESSION.get(url, headers=headers, stream=True, timeout=TIMEOUT, **kwargs) as response:
+        if response.status_code == 304:
+            log(f"  ✓ Not modified, using cached {name} download")
+            if meta.get('sha256'):
+                return cache_path, meta['sha256']
+            # Cache predates body hashing; hash the cached copy once
+            digest = hashlib.sha256()
+            with gzip.open(cache_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(STREAM_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+            meta['sha256'] = digest.hexdigest()
+        else:
+            response.raise_for_status()
+            
+            # Let urllib3 undo gzip/deflate transfer encoding while reading,
+            # and hash the body on the way into the cache
+            response.raw.decode_content = True
+            digest = hashlib.sha256()
+            tmp_path = cache_path + '.tmp'
+            with gzip.open(tmp_path, 'wb') as f:
+                for chunk in iter(lambda: response.raw.read(STREAM_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.replace(tmp_path, cache_path)
+            
+            meta = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest.hexdigest()
+            }
+    
+    write_atomic(meta_path, orjson.dumps(meta))
+    return cache_path, meta['sha256']
+
+def build_key(digest):
+    """Key for a build: body digest, script version and output options."""
+    return f'{digest}:{CODE_DIGEST}:{int(PRETTY_JSON)}'
+
+def is_unchanged(name, digest, filepath):
+    """Check whether filepath is exactly the JSON this script built from this body.
+    
+    The JSON's own hash is checked too, since the output comes from git and can
+    be replaced (checkout, revert, committed mock data) behind the cache's back.
+    """
+    if not os.path.exists(filepath):
+        return False
+    try:
+        with open(os.path.join(CACHE_DIR, f'{name}.sha'), encoding='utf-8') as f:
+            stored = f.read().strip()
+    except FileNotFoundError:
+        return False
+    if not stored.startswith(build_key(digest) + ':'):
+        return False
+    with open(filepath, 'rb') as f:
+        return stored == f'{build_key(digest)}:{hashlib.sha256(f.read()).hexdigest()}'
+
+def store_digest(name, digest, data=None):
+    """Record the body digest and written JSON bytes of the current output (None forgets it)."""
+    path = os.path.join(CACHE_DIR, f'{name}.sha')
+    if digest is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    write_atomic(path, f'{build_key(digest)}:{hashlib.sha256(data).hexdigest()}'.encode('utf-8'))
+
+def load_cached_frame(name):
+    """Return the cleaned DataFrame from the Parquet cache if USE_CACHE=1 and it is fresh."""
+    path = os.path.join(CACHE_DIR, f'{name}.parquet')
+    if not USE_CACHE or not os.path.exists(path):
+        return None
+    if time.time() - os.path.getmtime(path) > CACHE_TTL:
+        return None
+    log(f"  ✓ Using cached {name} DataFrame from {path}")
+    return pd.read_parquet(path)
+
+def save_frame(name, df):
+    """Persist a cleaned DataFrame to the Parquet cache."""
+    path = os.path.join(CACHE_DIR, f'{name}.parquet')
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+
+def load_frame(name, url, parse, filepath, **kwargs):
+    """Download and parse a dataset into its cleaned DataFrame.
+    
+    Returns (df, digest). df is None when the JSON at filepath is already
+    up to date; digest is None when the frame came from the Parquet cache.
+    """
+    df = load_cached_frame(name)
+    if df is not None:
+        return df, None
+    
+    cache_path, digest = fetch_with_cache(name, url, **kwargs)
+    if is_unchanged(name, digest, filepath):
+        return None, digest
+    
+    df = parse(cache_path)
+    save_frame(name, df)
+    return df, digest
+
+def to_json_bytes(payload):
+    """Serialize a payload to UTF-8 JSON bytes (numpy values supported)."""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    if PRETTY_JSON:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(payload, option=option)
+
+def save_json(filepath, payload):
+    """Write a payload as JSON plus a precompressed .json.gz sibling; returns the JSON bytes."""
+    data = to_json_bytes(payload)
+    write_atomic(filepath, data)
+    # mtime=0 keeps the gzip bytes stable for identical JSON
+    write_atomic(filepath + '.gz', gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    return data
+
+def utc_now_iso():
+    """Current UTC time as an ISO 8601 string with a 'Z' suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
 def ensure_data_dir():
     """Create data directory if it doesn't exist."""
     os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
     print(f"✓ Data directory: {DATA_DIR}")
 
-def fetch_co2_data():
+def parse_co2_csv(cache_path):
+    """Parse the cached NOAA CSV into a clean (year, month, average) frame."""
+    # Skip header lines starting with #
+    with gzip.open(cache_path, 'rb') as stream:
+        raw = b''.join(line for line in stream if not line.startswith(b'#'))
+    
+    # Parse CSV with pyarrow (multi-threaded, releases the GIL).
+    # The first non-comment line is the column header, so name the
+    # columns directly and skip it.
+    table = pac.read_csv(
+        io.BytesIO(raw),
+        read_options=pac.ReadOptions(
+            skip_rows=1,
+            column_names=['year', 'month', 'decimal_date', 'average', 'deseasonalized', 'days', 'std_days', 'unc']
+        ),
+        convert_options=pac.ConvertOptions(include_columns=['year', 'month', 'average'])
+    )
+    df = table.to_pandas()
+    
+    # Ensure numeric
+    df['average'] = pd.to_numeric(df['average'], errors='coerce')
+    
+    # Clean data
+    df = df.dropna(subset=['average'])
+    df = df[df['average'] > 0]  # Remove invalid values (-99.99)
+    
+    # Normalize types and sort by date
+    df['year'] = df['year'].astype('int32')
+    df['month'] = df['month'].astype('int32')
+    df['average'] = df['average'].astype('float64').round(2)
+    return df[['year', 'month', 'average']].sort_values(['year', 'month'])
+
+def fetch_co2_data(last_updated=None):
     """Fetch monthly CO2 data from NOAA Mauna Loa."""
-    print("\n📊 Fetching CO2 data from NOAA...")
+    log("\n📊 Fetching CO2 data from NOAA...")
+    filepath = os.path.join(DATA_DIR, 'co2_monthly.json')
     try:
         # Use verify=False just in case
-        response = requests.get(URLS['co2'], timeout=TIMEOUT, verify=False)
-        response.raise_for_status()
+        df, digest = load_frame('co2', URLS['co2'], parse_co2_csv, filepath, verify=False)
+        if df is None:
+            log(f"  ✓ Upstream data unchanged, keeping {filepath}")
+            return True
         
-        # Parse CSV with robust handling
-        # Skip header lines starting with #
-        df = pd.read_csv(
-            StringIO(response.text),
-            comment='#',
-            names=['year', 'month', 'decimal_date', 'average', 'deseasonalized', 'days', 'std_days', 'unc'],
-            skipinitialspace=True
-        )
-        
-        # Ensure numeric
-        df['average'] = pd.to_numeric(df['average'], errors='coerce')
-        
-        # Clean data
-        df = df.dropna(subset=['average'])
-        df = df[df['average'] > 0]  # Remove invalid values (-99.99)
-        
-        # Convert to records
-        records = []
-        for _, row in df.iterrows():
-            records.append({
-                'year': int(row['year']),
-                'month': int(row['month']),
-                'average': round(float(row['average']), 2),
-            })
-        
-        # Sort by date
-        records.sort(key=lambda x: (x['year'], x['month']))
+        # Convert to records (vectorized)
+        records = df.to_dict('records')
         
         result = {
             'source': 'NOAA Global Monitoring Laboratory',
             'location': 'Mauna Loa Observatory, Hawaii',
             'unit': 'ppm',
-            'last_updated': datetime.utcnow().isoformat() + 'Z',
+            'last_updated': last_updated or utc_now_iso(),
             'data': records
         }
         
         # Save JSON
-        filepath = os.path.join(DATA_DIR, 'co2_monthly.json')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        data = save_json(filepath, result)
+        store_digest('co2', digest, data)
         
-        print(f"  ✓ Saved {len(records)} CO2 records to {filepath}")
+        log(f"  ✓ Saved {len(records)} CO2 records to {filepath}")
         return True
         
     except Exception as e:
-        print(f"  ✗ Error fetching CO2 data: {e}")
+        log(f"  ✗ Error fetching CO2 data: {e}")
+        store_digest('co2', None)
         return False
 
-def generate_mock_temperature_data():
+def generate_mock_temperature_data(last_updated=None):
     """Generate realistic mock temperature data if fetch fails."""
-    print("  ⚠️ Generating MOCK temperature data (fallback)...")
+    log("  ⚠️ Generating MOCK temperature data (fallback)...")
     
     current_date = datetime.now()
     current_year = current_date.year
     current_month = current_date.month
     
     # 1880 to current year
-    years = range(1880, current_year + 1)
-    records = []
+    years = np.arange(1880, current_year + 1)
+    months = np.arange(1, 13)
     
     # Global warming trend approx 0.08C per decade since 1880, accelerated recently
-    for year in years:
-        # Base trend
-        trend = (year - 1880) * 0.007
-        if year > 1970:
-             trend += (year - 1970) * 0.015
-        
-        # Shift to align with baseline 1951-1980 (approx 0 anomaly)
-        # 1965 is approx center of baseline? No, average of baseline is 0.
-        # Let's just make it look right.
-        trend -= 0.3 
-        
-        # Determine months to generate for this year
-        end_month = 12
-        if year == current_year:
-            # For current year, generate up to current month (inclusive) for demo purposes, 
-            # or previous month for realism. Let's do up to previous month.
-            end_month = current_month - 1 if current_month > 1 else 0
-            
-        for month in range(1, end_month + 1):
-            # Monthly noise
-            noise = np.random.normal(0, 0.15)
-            # Seasonal variation of anomaly is small globally, but random fluctuations matter
-            anomaly = trend + noise
-            
-            records.append({
-                'year': year,
-                'month': month,
-                'anomaly': round(float(anomaly), 2)
-            })
+    trend = (years - 1880) * 0.007 + np.where(years > 1970, (years - 1970) * 0.015, 0)
+    # Shift to align with baseline 1951-1980 (approx 0 anomaly)
+    trend -= 0.3
+    
+    # Monthly noise for every (year, month) in a single draw
+    # Seasonal variation of anomaly is small globally, but random fluctuations matter
+    rng = np.random.default_rng()
+    anomalies = trend[:, None] + rng.normal(0, 0.15, size=(len(years), len(months)))
+    
+    # For the current year, only generate up to the previous month for realism
+    year_grid, month_grid = np.meshgrid(years, months, indexing='ij')
+    mask = (year_grid < current_year) | (month_grid < current_month)
+    
+    # Columnar layout: one array per field
+    columns = {
+        'year': year_grid[mask].astype(np.int32),
+        'month': month_grid[mask].astype(np.int8),
+        'anomaly': np.round(anomalies[mask].astype(np.float32), 2)
+    }
 
     result = {
         'source': 'NASA Goddard Institute for Space Studies [MOCK DATA]',
         'baseline': '1951-1980',
         'unit': '°C',
-        'last_updated': datetime.utcnow().isoformat() + 'Z',
-        'data': records
+        'last_updated': last_updated or utc_now_iso(),
+        'data': columns
     }
     
     # Save JSON
     filepath = os.path.join(DATA_DIR, 'temperature_anomaly.json')
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    save_json(filepath, result)
     
-    print(f"  ✓ Saved MOCK temperature records to {filepath}")
+    log(f"  ✓ Saved MOCK temperature records to {filepath}")
     return True
 
-def fetch_temperature_data():
-    """Fetch global temperature anomaly from NASA GISS."""
-    print("\n🌡️ Fetching temperature data from NASA GISS...")
+def parse_temperature_csv(cache_path):
+    """Parse the cached GISS CSV into a long (Year, month, anomaly) frame."""
+    with gzip.open(cache_path, 'rb') as stream:
+        raw = stream.read()
+    
+    # Find header row (contains 'Year') near the top of the file
+    head_lines = raw[:STREAM_BUFFER_SIZE].split(b'\n')
     try:
-        response = requests.get(URLS['temperature'], timeout=TIMEOUT)
-        response.raise_for_status()
-        
-        # Parse CSV
-        lines = response.text.strip().split('\n')
-        # Find header row (contains 'Year')
-        try:
-            header_idx = next(i for i, l in enumerate(lines) if 'Year' in l)
-        except StopIteration:
-            print("  ✗ Could not find 'Year' header in response")
-            # raise to trigger fallback
-            raise ValueError("Header not found")
-            
-        df = pd.read_csv(
-            StringIO('\n'.join(lines[header_idx:])),
-            na_values=['***', '****']
+        header_idx = next(i for i, l in enumerate(head_lines) if b'Year' in l)
+    except StopIteration:
+        log("  ✗ Could not find 'Year' header in response")
+        # raise to trigger fallback
+        raise ValueError("Header not found")
+    
+    # Parse CSV with pyarrow (multi-threaded, releases the GIL)
+    table = pac.read_csv(
+        io.BytesIO(raw),
+        read_options=pac.ReadOptions(skip_rows=header_idx),
+        convert_options=pac.ConvertOptions(
+            null_values=['', '***', '****'],
+            strings_can_be_null=True
         )
+    )
+    df = table.to_pandas()
+    
+    # Extract monthly data (resolve the month columns once, not per row)
+    columns = set(df.columns)
+    month_cols = [m for m in MONTH_NAMES if m in columns]
+    
+    # Drop rows without a valid year (e.g. repeated header lines)
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+    df = df.dropna(subset=['Year'])
+    df[month_cols] = df[month_cols].apply(pd.to_numeric, errors='coerce')
+    
+    # Reshape wide (one column per month) to long (one row per month)
+    long_df = df.melt(
+        id_vars='Year',
+        value_vars=month_cols,
+        var_name='m',
+        value_name='anomaly'
+    )
+    long_df = long_df.dropna(subset=['anomaly'])
+    long_df['month'] = long_df['m'].map(MONTH_INDEX)
+    long_df = long_df.sort_values(['Year', 'month'])
+    return long_df[['Year', 'month', 'anomaly']]
+
+def fetch_temperature_data(last_updated=None):
+    """Fetch global temperature anomaly from NASA GISS."""
+    log("\n🌡️ Fetching temperature data from NASA GISS...")
+    filepath = os.path.join(DATA_DIR, 'temperature_anomaly.json')
+    try:
+        df, digest = load_frame('temperature', URLS['temperature'], parse_temperature_csv, filepath)
+        if df is None:
+            log(f"  ✓ Upstream data unchanged, keeping {filepath}")
+            return True
         
-        # Extract monthly data
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        records = []
-        for _, row in df.iterrows():
-            try:
-                year = int(row['Year'])
-                for i, month in enumerate(months, 1):
-                    if month in df.columns and pd.notna(row[month]):
-                        anomaly = float(row[month])
-                        records.append({
-                            'year': year,
-                            'month': i,
-                            'anomaly': round(anomaly, 2)
-                        })
-            except (ValueError, KeyError, TypeError):
-                continue
+        # Keep the data columnar (one compact array per field) instead of
+        # building a dict per record
+        columns = {
+            'year': df['Year'].to_numpy(dtype=np.int32),
+            'month': df['month'].to_numpy(dtype=np.int8),
+            'anomaly': np.round(df['anomaly'].to_numpy(dtype=np.float32), 2)
+        }
         
         result = {
             'source': 'NASA Goddard Institute for Space Studies',
             'baseline': '1951-1980',
             'unit': '°C',
-            'last_updated': datetime.utcnow().isoformat() + 'Z',
-            'data': records
+            'last_updated': last_updated or utc_now_iso(),
+            'data': columns
         }
         
         # Save JSON
-        filepath = os.path.join(DATA_DIR, 'temperature_anomaly.json')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        data = save_json(filepath, result)
+        store_digest('temperature', digest, data)
         
-        print(f"  ✓ Saved {len(records)} temperature records to {filepath}")
+        log(f"  ✓ Saved {len(columns['year'])} temperature records to {filepath}")
         return True
         
     except Exception as e:
-        print(f"  ✗ Error fetching temperature data: {e}")
-        return generate_mock_temperature_data()
+        log(f"  ✗ Error fetching temperature data: {e}")
+        store_digest('temperature', None)
+        return generate_mock_temperature_data(last_updated)
 
-def generate_mock_sea_ice_data():
+def generate_mock_sea_ice_data(last_updated=None):
     """Generate realistic mock sea ice data if fetch fails."""
-    print("  ⚠️ Generating MOCK sea ice data (fallback)...")
+    log("  ⚠️ Generating MOCK sea ice data (fallback)...")
     
     current_date = datetime.now()
     current_year = current_date.year
     current_month = current_date.month
     
-    years = range(2000, current_year + 1)
-    years_data = {}
+    years = np.arange(2000, current_year + 1)
     
     # Approximate seasonal cycle (max in March ~15M, min in Sept ~4M)
     # Plus a downward trend of -0.05M per year
     base_season = np.array([14.0, 15.0, 15.2, 14.5, 12.5, 11.0, 8.5, 6.0, 4.5, 6.5, 9.5, 12.0])
+    trend = (years - 2000)[:, None] * -0.05
     
-    for year in years:
-        trend = (year - 2000) * -0.05
-        # Add some random noise
-        noise = np.random.normal(0, 0.3, 12)
-        
-        # Determine months for this year
-        end_month = 12
-        if year == current_year:
-            end_month = current_month - 1 if current_month > 1 else 0
-        
-        monthly_data = []
-        for month in range(1, end_month + 1):
-            val = max(0, base_season[month-1] + trend + noise[month-1])
-            monthly_data.append({
-                'month': month,
-                'extent': round(float(val), 2)
-            })
-        years_data[str(year)] = monthly_data
+    # Whole (year, month) grid at once: season + trend + random noise, clipped at 0
+    rng = np.random.default_rng()
+    noise = rng.normal(0, 0.3, (len(years), 12))
+    values = np.round(np.clip(base_season[None, :] + trend + noise, 0, None), 2)
+    
+    # For the current year, only months up to the previous one
+    years_data = {}
+    for yi, year in enumerate(years):
+        end_month = current_month - 1 if year == current_year else 12
+        years_data[str(year)] = [
+            {'month': month, 'extent': values[yi, month - 1]}
+            for month in range(1, end_month + 1)
+        ]
 
     # Generate median (using the base season + offset for 1981-2010 proxy)
-    median_data = {}
-    for month in range(1, 13):
-        median_data[str(month)] = round(base_season[month-1] + 1.5, 2)
+    median = np.round(base_season + 1.5, 2)
+    median_data = {str(month): median[month-1] for month in range(1, 13)}
 
     result = {
         'source': 'National Snow and Ice Data Center (NSIDC) [MOCK DATA]',
         'region': 'Arctic',
         'unit': 'million km²',
-        'last_updated': datetime.utcnow().isoformat() + 'Z',
+        'last_updated': last_updated or utc_now_iso(),
         'median': median_data,
         'data': years_data
     }
     
     # Save JSON
     filepath = os.path.join(DATA_DIR, 'sea_ice_extent.json')
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    save_json(filepath, result)
     
-    print(f"  ✓ Saved MOCK sea ice data to {filepath}")
+    log(f"  ✓ Saved MOCK sea ice data to {filepath}")
     return True
 
-def fetch_sea_ice_data():
+def parse_sea_ice_csv(cache_path):
+    """Parse the cached NSIDC daily CSV into monthly (Year, Month, Extent) means."""
+    # Parse CSV incrementally with pyarrow's streaming reader (decompresses
+    # .gz itself), so only one block of daily rows is in memory at a time.
+    # Skip the header and the units row below it ('YYYY', 'MM', ...) and
+    # name the columns directly instead of stripping the padded header.
+    reader = pac.open_csv(
+        cache_path,
+        read_options=pac.ReadOptions(
+            skip_rows=2,
+            column_names=['Year', 'Month', 'Day', 'Extent', 'Missing', 'Source Data'],
+            block_size=CSV_BLOCK_SIZE
+        ),
+        parse_options=pac.ParseOptions(ignore_empty_lines=True),
+        convert_options=pac.ConvertOptions(
+            include_columns=['Year', 'Month', 'Extent'],
+            column_types={'Year': pa.int32(), 'Month': pa.int32(), 'Extent': pa.float64()},
+            null_values=['', 'NA', '-9999'],
+            strings_can_be_null=True
+        )
+    )
+    
+    # Accumulate running per-(Year, Month) sums and counts block by block,
+    # in flat tables indexed by year * 12 + (month - 1)
+    sums = np.zeros(0)
+    counts = np.zeros(0, dtype=np.int64)
+    for batch in reader:
+        chunk = batch.to_pandas().dropna(subset=['Year', 'Month', 'Extent'])
+        chunk = chunk[chunk['Month'].between(1, 12)]
+        key = chunk['Year'].to_numpy(dtype=np.int64) * 12 + chunk['Month'].to_numpy(dtype=np.int64) - 1
+        block_sums = np.bincount(key, weights=chunk['Extent'].to_numpy(dtype=np.float64))
+        block_counts = np.bincount(key)
+        if len(block_sums) > len(sums):
+            sums = np.pad(sums, (0, len(block_sums) - len(sums)))
+            counts = np.pad(counts, (0, len(block_counts) - len(counts)))
+        sums[:len(block_sums)] += block_sums
+        counts[:len(block_counts)] += block_counts
+    
+    # Average daily values per month (keys come out sorted by year, month)
+    filled = np.flatnonzero(counts)
+    monthly = pd.DataFrame({
+        'Year': filled // 12,
+        'Month': filled % 12 + 1,
+        'Extent': np.round(sums[filled] / counts[filled], 2)
+    })
+    return monthly
+
+def fetch_sea_ice_data(last_updated=None):
     """Fetch Arctic sea ice extent from NSIDC."""
-    print("\n❄️ Fetching sea ice data from NSIDC...")
+    log("\n❄️ Fetching sea ice data from NSIDC...")
+    filepath = os.path.join(DATA_DIR, 'sea_ice_extent.json')
     try:
         # Use verify=False because of SSL issues with masie_web.apps.nsidc.org
-        response = requests.get(URLS['sea_ice'], timeout=TIMEOUT, verify=False)
-        response.raise_for_status()
-        
-        # Parse CSV
-        df = pd.read_csv(
-            StringIO(response.text),
-            skipinitialspace=True
-        )
-        
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        
-        # Clean Data
-        df = df[df['Year'].notna()]
-        df = df[df['Month'].notna()]
-        df = df[df['Extent'].notna()]
+        monthly, digest = load_frame('sea_ice', URLS['sea_ice'], parse_sea_ice_csv, filepath, verify=False)
+        if monthly is None:
+            log(f"  ✓ Upstream data unchanged, keeping {filepath}")
+            return True
         
-        # Group by year and month (average daily values per month)
-        df['Year'] = df['Year'].astype(int)
-        df['Month'] = df['Month'].astype(int)
-        df['Extent'] = pd.to_numeric(df['Extent'], errors='coerce')
-        
-        monthly = df.groupby(['Year', 'Month'])['Extent'].mean().reset_index()
+        # Calculate 1981-2010 median for each month
+        # (Year x Month grid; missing years/months become NaN and are ignored)
+        baseline = (monthly.pivot(index='Year', columns='Month', values='Extent')
+                           .reindex(index=range(1981, 2011), columns=range(1, 13)))
+        values = baseline.to_numpy(dtype=np.float64)
+        has_data = ~np.isnan(values).all(axis=0)
+        median = np.full(12, np.nan)
+        median[has_data] = np.round(np.nanmedian(values[:, has_data], axis=0), 2)
+        median_data = {str(month): median[month - 1] for month in range(1, 13) if has_data[month - 1]}
         
         # Organize by year
-        years_data = {}
-        for _, row in monthly.iterrows():
-            year = str(int(row['Year']))
-            if year not in years_data:
-                years_data[year] = []
-            years_data[year].append({
-                'month': int(row['Month']),
-                'extent': round(float(row['Extent']), 2)
-            })
-        
-        # Calculate 1981-2010 median for each month
-        baseline_years = [str(y) for y in range(1981, 2011)]
-        median_data = {}
-        for month in range(1, 13):
-            monthly_values = []
-            for year in baseline_years:
-                if year in years_data:
-                    month_data = next((d for d in years_data[year] if d['month'] == month), None)
-                    if month_data:
-                        monthly_values.append(month_data['extent'])
-            if monthly_values:
-                median_data[str(month)] = round(pd.Series(monthly_values).median(), 2)
+        years_data = {
+            str(year): group[['Month', 'Extent']]
+                .rename(columns={'Month': 'month', 'Extent': 'extent'})
+                .to_dict('records')
+            for year, group in monthly.groupby('Year')
+        }
         
         result = {
             'source': 'National Snow and Ice Data Center (NSIDC)',
             'region': 'Arctic',
             'unit': 'million km²',
-            'last_updated': datetime.utcnow().isoformat() + 'Z',
+            'last_updated': last_updated or utc_now_iso(),
             'median': median_data,
             'data': years_data
         }
         
         # Save JSON
-        filepath = os.path.join(DATA_DIR, 'sea_ice_extent.json')
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        data = save_json(filepath, result)
+        store_digest('sea_ice', digest, data)
         
-        print(f"  ✓ Saved sea ice data for {len(years_data)} years to {filepath}")
+        log(f"  ✓ Saved sea ice data for {len(years_data)} years to {filepath}")
         return True
         
     except Exception as e:
-        print(f"  ✗ Error fetching sea ice data: {e}")
+        log(f"  ✗ Error fetching sea ice data: {e}")
+        store_digest('sea_ice', None)
         # Fallback to mock data
-        return generate_mock_sea_ice_data()
+        return generate_mock_sea_ice_data(last_updated)
 
 def main():
     """Main entry point."""
@@ -349,11 +609,23 @@ def main():
     
     ensure_data_dir()
     
-    results = {
-        'CO2': fetch_co2_data(),
-        'Temperature': fetch_temperature_data(),
-        'Sea Ice': fetch_sea_ice_data()
-    }
+    # All datasets of one run share the same timestamp
+    last_updated = utc_now_iso()
+    
+    fetchers = [
+        ('CO2', fetch_co2_data),
+        ('Temperature', fetch_temperature_data),
+        ('Sea Ice', fetch_sea_ice_data)
+    ]
+    
+    # Sources live on independent hosts, so fetch them concurrently; each
+    # fetcher's log is printed as one block once it finishes
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = {name: executor.submit(run_buffered, fn, last_updated) for name, fn in fetchers}
+        for name, future in futures.items():
+            results[name], output = future.result()
+            print(output)
     
     print("\n" + "=" * 60)
     print("📋 Summary:")